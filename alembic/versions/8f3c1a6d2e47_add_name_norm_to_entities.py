@@ -0,0 +1,46 @@
+"""Add name_norm to entities
+
+Revision ID: 8f3c1a6d2e47
+Revises: c445067c8c99
+Create Date: 2026-10-15 11:26:05.904318
+
+"""
+import unicodedata
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f3c1a6d2e47'
+down_revision: Union[str, None] = 'c445067c8c99'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Frozen copy of app.models.entity.normalize_name as of this revision, so the
+# backfill does not change (or break) when the application code does
+def normalize_name(name):
+    if name is None:
+        return None
+    decomposed = unicodedata.normalize('NFKD', str(name))
+    folded = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return ' '.join(folded.lower().split())
+
+
+def upgrade() -> None:
+    op.add_column('entities', sa.Column('name_norm', sa.String(length=500), nullable=True))
+    op.create_index(op.f('ix_entities_name_norm'), 'entities', ['name_norm'], unique=False)
+
+    # Backfill in Python: SQL lower() cannot strip accents the way normalize_name does
+    conn = op.get_bind()
+    rows = conn.execute(sa.text('SELECT id, name FROM entities')).all()
+    updates = [{'id': row.id, 'name_norm': normalize_name(row.name)} for row in rows]
+    if updates:
+        conn.execute(sa.text('UPDATE entities SET name_norm = :name_norm WHERE id = :id'), updates)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_entities_name_norm'), table_name='entities')
+    op.drop_column('entities', 'name_norm')
@@ -0,0 +1,32 @@
+"""Add trigram index on entity names
+
+Revision ID: c445067c8c99
+Revises: 29d9215ebe22
+Create Date: 2026-10-15 09:12:31.418207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c445067c8c99'
+down_revision: Union[str, None] = '29d9215ebe22'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # pg_trgm is Postgres-only; SQLite deployments screen from the in-memory cache
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.execute('CREATE INDEX entities_name_trgm ON entities USING gin (lower(name) gin_trgm_ops)')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('DROP INDEX IF EXISTS entities_name_trgm')
@@ -0,0 +1,33 @@
+"""Replace alias_name index with (entity_id, lower(alias_name))
+
+Revision ID: d2a94c7e5b18
+Revises: 8f3c1a6d2e47
+Create Date: 2026-10-15 12:48:19.260735
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a94c7e5b18'
+down_revision: Union[str, None] = '8f3c1a6d2e47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index('ix_aliases_alias_name', table_name='aliases')
+    op.create_index('ix_aliases_entity_lower', 'aliases', ['entity_id', sa.text('lower(alias_name)')], unique=False)
+    if op.get_bind().dialect.name == 'postgresql':
+        # pg_trgm is created by c445067c8c99
+        op.execute('CREATE INDEX aliases_alias_name_trgm ON aliases USING gin (lower(alias_name) gin_trgm_ops)')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS aliases_alias_name_trgm')
+    op.drop_index('ix_aliases_entity_lower', table_name='aliases')
+    op.create_index('ix_aliases_alias_name', 'aliases', ['alias_name'], unique=False)
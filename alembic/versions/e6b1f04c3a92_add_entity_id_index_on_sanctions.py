@@ -0,0 +1,26 @@
+"""Add entity_id index on sanctions
+
+Revision ID: e6b1f04c3a92
+Revises: d2a94c7e5b18
+Create Date: 2026-10-15 16:21:05.184372
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6b1f04c3a92'
+down_revision: Union[str, None] = 'd2a94c7e5b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_sanctions_entity_id'), 'sanctions', ['entity_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_sanctions_entity_id'), table_name='sanctions')
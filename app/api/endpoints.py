@@ -1,9 +1,13 @@
+import time
+import numpy as np
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from fuzzywuzzy import process
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, selectinload
+from rapidfuzz import process, fuzz, utils
 from typing import Optional, List
 from app.db.session import SessionLocal
-from app.models.entity import Entity, Alias
+from app.models.entity import Entity, Alias, normalize_name
 from pydantic import BaseModel
 
 class ScreenRequest(BaseModel):
@@ -21,6 +25,67 @@ class ScreenResponse(BaseModel):
 
 router = APIRouter()
 
+# The sanctions list only changes on re-ingest, so the screenable names are
+# held in memory and the fuzzy scan never touches the database.
+ENTITY_CACHE_TTL_SECONDS = 300
+
+def build_screening_arrays(rows):
+    """
+    Build (ids, names, lengths) arrays from (id, name_norm) rows, ordered by
+    the length of the preprocessed name so a length window is a contiguous slice.
+    """
+    # Single pass so rows can be a streaming result rather than a list
+    ids, names = [], []
+    for entity_id, name_norm in rows:
+        ids.append(entity_id)
+        names.append(utils.default_process(name_norm))
+    lengths = np.fromiter((len(name) for name in names), dtype=np.int64, count=len(names))
+    order = np.argsort(lengths, kind="stable")
+    ids = np.array(ids, dtype=np.int64)
+    return ids[order], np.array(names, dtype=object)[order], lengths[order]
+
+_ENTITY_CACHE = {"data": build_screening_arrays([]), "expires": 0.0}
+
+def uses_trigram_search(db: Session) -> bool:
+    """Postgres shortlists candidates with pg_trgm and never reads the cache."""
+    return db.get_bind().dialect.name == "postgresql"
+
+def refresh_entity_cache(db: Session):
+    """Reload entity ids and preprocessed names into the screening cache."""
+    if uses_trigram_search(db):
+        # No point scanning every entity into memory on each worker
+        return
+    # Core column select streamed in chunks: no ORM objects, no full row list
+    rows = db.execute(
+        select(Entity.id, Entity.name_norm)
+        .where(Entity.name_norm.isnot(None))
+        .execution_options(yield_per=1000)
+    )
+    # Swap all arrays in one assignment so readers never see a mixed set
+    _ENTITY_CACHE["data"] = build_screening_arrays(rows)
+    _ENTITY_CACHE["expires"] = time.monotonic() + ENTITY_CACHE_TTL_SECONDS
+
+def get_entity_cache(db: Session):
+    if time.monotonic() >= _ENTITY_CACHE["expires"]:
+        refresh_entity_cache(db)
+    return _ENTITY_CACHE["data"]
+
+# On Postgres the pg_trgm index shortlists candidates so large lists are
+# never scanned in full; only this many are re-ranked with RapidFuzz.
+TRIGRAM_CANDIDATE_LIMIT = 500
+
+def get_trigram_candidates(db: Session, query: str):
+    """Shortlist entity ids and preprocessed names similar to the query."""
+    lower_name = func.lower(Entity.name)
+    rows = (
+        db.query(Entity.id, Entity.name_norm)
+        .filter(lower_name.op("%")(query))
+        .order_by(func.similarity(lower_name, query).desc())
+        .limit(TRIGRAM_CANDIDATE_LIMIT)
+        .all()
+    )
+    return build_screening_arrays(rows)
+
 # Dependency to get a DB session
 def get_db():
     db = SessionLocal()
@@ -29,37 +94,99 @@ def get_db():
     finally:
         db.close()
 
-@router.post("/v1/screen", response_model=ScreenResponse)
-def screen_entity(request: ScreenRequest, db: Session = Depends(get_db)):
-    entities = db.query(Entity).all()
-    choices = {e.id: e.name for e in entities if e.name}
+def rank_matches(query: str, ids, names, lengths):
+    """Return the ids and cached names of the top 10 names scoring at least 85."""
+    # WRatio caps any pair whose lengths differ by more than 8x at 60, below the
+    # cutoff, so only names inside that length window are scored at all.
+    lo = np.searchsorted(lengths, -(-len(query) // 8), side="left")
+    hi = np.searchsorted(lengths, len(query) * 8, side="right")
+    ids, names = ids[lo:hi], names[lo:hi]
     
-    fuzzy_matches = process.extractBests(request.entity_name, choices, score_cutoff=85, limit=10)
+    # WRatio over default_process'd strings reproduces fuzzywuzzy's extractBests
+    # scoring; cdist scores the window in one multithreaded C++ call, and
+    # score_cutoff lets it abandon hopeless pairs early.
+    scores = process.cdist(
+        [query],
+        names,
+        scorer=fuzz.WRatio,
+        score_cutoff=85,
+        dtype=np.uint8,
+        workers=-1,
+    )[0]
     
-    match_ids = [match[2] for match in fuzzy_matches]
+    candidates = np.nonzero(scores >= 85)[0]
+    # Rank key packs best-score-first and lowest-id-on-ties into one int64,
+    # so a partial partition finds the top 10 without sorting every candidate.
+    keys = (100 - scores[candidates].astype(np.int64)) << 32 | ids[candidates]
+    top = np.argpartition(keys, 10)[:10] if len(keys) > 10 else np.arange(len(keys))
+    top = top[np.argsort(keys[top])]
+    return ids[candidates[top]].tolist(), names[candidates[top]].tolist()
+
+def hydrate_matches(db: Session, match_ids, match_names):
+    """
+    Load the matched entities in score order.
     
-    final_results = db.query(Entity).filter(Entity.id.in_(match_ids)).all()
+    Returns (entities, stale): an id whose row is gone or no longer carries the
+    name it was scored on is dropped and flags the id/name arrays as stale.
+    """
+    hydrated = (
+        db.query(Entity)
+        .options(selectinload(Entity.aliases))
+        .filter(Entity.id.in_(match_ids))
+        .all()
+    )
+    # IN () returns rows in arbitrary order; restore the score ranking by id
+    by_id = {entity.id: entity for entity in hydrated}
+    final_results = [
+        by_id[entity_id]
+        for entity_id, name in zip(match_ids, match_names)
+        if entity_id in by_id and utils.default_process(by_id[entity_id].name_norm or "") == name
+    ]
+    return final_results, len(final_results) != len(match_ids)
+
+@router.post("/v1/screen", response_model=ScreenResponse)
+def screen_entity(request: ScreenRequest, db: Session = Depends(get_db)):
+    query = utils.default_process(normalize_name(request.entity_name))
+    if uses_trigram_search(db):
+        match_ids, match_names = rank_matches(query, *get_trigram_candidates(db, request.entity_name.lower()))
+        final_results, _ = hydrate_matches(db, match_ids, match_names)
+    else:
+        match_ids, match_names = rank_matches(query, *get_entity_cache(db))
+        final_results, stale = hydrate_matches(db, match_ids, match_names)
+        if stale:
+            # Re-ingest deletes and re-inserts every entity, so cached ids can
+            # point at other rows; rebuild the cache and screen again
+            refresh_entity_cache(db)
+            match_ids, match_names = rank_matches(query, *_ENTITY_CACHE["data"])
+            final_results, _ = hydrate_matches(db, match_ids, match_names)
 
+    # Returning the response directly skips response_model validation and the
+    # jsonable_encoder pass; the models above still document the shape.
     response_matches = [
-        MatchResult(
-            entity_id=entity.id,
-            name=entity.name,
-            type=entity.type,
-            source=entity.source,
-            aliases=[alias.alias_name for alias in entity.aliases]
-        ) for entity in final_results
+        {
+            "entity_id": entity.id,
+            "name": entity.name,
+            "type": entity.type,
+            "source": entity.source,
+            "aliases": [alias.alias_name for alias in entity.aliases]
+        } for entity in final_results
     ]
-    return ScreenResponse(matches=response_matches)
+    return ORJSONResponse({"matches": response_matches})
 
 @router.get("/v1/entity/{entity_id}")
 def get_entity(entity_id: int, db: Session = Depends(get_db)):
-    entity = db.query(Entity).filter(Entity.id == entity_id).first()
+    entity = (
+        db.query(Entity)
+        .options(selectinload(Entity.aliases))
+        .filter(Entity.id == entity_id)
+        .first()
+    )
     if entity:
-        return {
+        return ORJSONResponse({
             "id": entity.id,
             "name": entity.name,
             "type": entity.type,
             "source": entity.source,
             "aliases": [alias.alias_name for alias in entity.aliases]
-        }
-    return {"error": "Entity not found"} 
\ No newline at end of file
+        })
+    return ORJSONResponse({"error": "Entity not found"}) 
\ No newline at end of file
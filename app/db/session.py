@@ -1,10 +1,36 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./project_sentinel.db")
 
-engine = create_engine(DATABASE_URL)
+def pool_options(database_url):
+    """Pool sizing for QueuePool-backed URLs; in-memory SQLite uses a pool that takes no size."""
+    url = make_url(database_url)
+    if issubclass(url.get_dialect().get_pool_class(url), QueuePool):
+        return {"pool_size": 20, "max_overflow": 10}
+    return {}
+
+# Sized for FastAPI's worker threadpool; pre-ping drops connections the server closed
+engine = create_engine(DATABASE_URL, pool_pre_ping=True, **pool_options(DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base() 
\ No newline at end of file
+Base = declarative_base()
+
+def tune_sqlite_engine(engine):
+    """Switches SQLite connections on this engine to WAL with relaxed fsync, memory-mapped reads and a larger page cache."""
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        # In WAL mode NORMAL only fsyncs at checkpoints, not on every commit
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute("PRAGMA cache_size=-65536")
+        cursor.close()
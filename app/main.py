@@ -1,13 +1,14 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 
 # Import the new API router
-from app.api.endpoints import router as api_router
+from app.api.endpoints import router as api_router, refresh_entity_cache
+from app.db.session import SessionLocal
 
 # --- FastAPI App Initialization ---
-app = FastAPI(title="Project Sentinel API")
+app = FastAPI(title="Project Sentinel API", default_response_class=ORJSONResponse)
 
 # --- CORS Middleware ---
 origins = [
@@ -22,6 +23,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# --- Warm the screening cache ---
+@app.on_event("startup")
+def warm_entity_cache():
+    db = SessionLocal()
+    try:
+        refresh_entity_cache(db)
+    finally:
+        db.close()
+
 # --- Include the API Routes ---
 # This line adds all the endpoints from our endpoints.py file
 app.include_router(api_router)
@@ -30,7 +40,8 @@ app.include_router(api_router)
 # This must come AFTER your API routes.
 
 # 1. Mount the 'static' folder from the React build
-app.mount("/static", StaticFiles(directory="dashboard-ui/build/static"), name="static")
+# check_dir=False lets the API start (and be imported) before the UI is built
+app.mount("/static", StaticFiles(directory="dashboard-ui/build/static", check_dir=False), name="static")
 
 # 2. Create a catch-all route that serves the index.html for any other path
 @app.get("/{full_path:path}")
@@ -5,8 +5,9 @@ This module defines the database schema for entities, aliases, and sanctions
 as specified in the PRD.
 """
 
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text
-from sqlalchemy.orm import relationship
+import unicodedata
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Index, func
+from sqlalchemy.orm import relationship, validates
 from datetime import datetime
 from app.db.session import Base
 
@@ -23,6 +24,7 @@ class Entity(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String(500), nullable=False, index=True)
     type = Column(String(100), nullable=False, index=True)  # e.g., 'terrorist', 'unlawful', 'individual'
+    name_norm = Column(String(500), nullable=True, index=True)  # normalize_name(name), kept in sync below
     
     # Optional fields for additional metadata
     description = Column(Text, nullable=True)
@@ -34,6 +36,11 @@ class Entity(Base):
     aliases = relationship("Alias", back_populates="entity", cascade="all, delete-orphan")
     sanctions = relationship("Sanction", back_populates="entity", cascade="all, delete-orphan")
     
+    @validates('name')
+    def _sync_name_norm(self, key, value):
+        self.name_norm = normalize_name(value)
+        return value
+    
     def __repr__(self):
         return f"<Entity(id={self.id}, name='{self.name}', type='{self.type}')>"
     
@@ -51,7 +58,7 @@ class Alias(Base):
     __tablename__ = 'aliases'
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    alias_name = Column(String(500), nullable=False, index=True)
+    alias_name = Column(String(500), nullable=False)
     entity_id = Column(Integer, ForeignKey('entities.id'), nullable=False)
     
     # Optional fields for alias metadata
@@ -62,6 +69,11 @@ class Alias(Base):
     # Relationships
     entity = relationship("Entity", back_populates="aliases")
     
+    # Covers the entity_id join and case-insensitive alias equality in one index
+    __table_args__ = (
+        Index('ix_aliases_entity_lower', entity_id, func.lower(alias_name)),
+    )
+    
     def __repr__(self):
         return f"<Alias(id={self.id}, alias_name='{self.alias_name}', entity_id={self.entity_id})>"
     
@@ -81,7 +93,7 @@ class Sanction(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     sanctioning_body = Column(String(200), nullable=False, index=True)  # e.g., 'MHA', 'UN Security Council', 'US Treasury'
     program = Column(String(300), nullable=False, index=True)  # e.g., 'Counter-Terrorism', 'OFAC SDN List'
-    entity_id = Column(Integer, ForeignKey('entities.id'), nullable=False)
+    entity_id = Column(Integer, ForeignKey('entities.id'), nullable=False, index=True)
     
     # Optional fields for sanction details
     sanction_type = Column(String(100), nullable=True)  # e.g., 'asset_freeze', 'travel_ban', 'arms_embargo'
@@ -117,11 +129,36 @@ class Relationship(Base):
     from_entity = relationship("Entity", foreign_keys=[from_entity_id], backref="outgoing_relationships")
     to_entity = relationship("Entity", foreign_keys=[to_entity_id], backref="incoming_relationships")
     
+    # One row per link; also the conflict target for idempotent bulk inserts
+    __table_args__ = (
+        Index('uq_relationships_from_to_type', from_entity_id, to_entity_id, relation_type, unique=True),
+    )
+    
     def __repr__(self):
         return f"<Relationship(id={self.id}, from={self.from_entity_id}, to={self.to_entity_id}, type='{self.relation_type}')>"
 
 
 # Helper functions for common database operations
+def normalize_name(name):
+    """
+    Helper function to normalize a name for matching.
+    
+    Accents are stripped, the text is lowercased and whitespace is collapsed.
+    Non-Latin scripts are kept as-is.
+    
+    Args:
+        name (str): Raw entity name
+    
+    Returns:
+        str: Normalized name, or None if name is None
+    """
+    if name is None:
+        return None
+    decomposed = unicodedata.normalize('NFKD', str(name))
+    folded = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return ' '.join(folded.lower().split())
+
+
 def create_entity_with_aliases(name, entity_type, aliases_list, source=None):
     """
     Helper function to create an entity with its aliases in a single operation.
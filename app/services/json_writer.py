@@ -0,0 +1,49 @@
+"""
+Streaming JSON writer shared by the scraper services.
+
+Writes a list of records to disk one record at a time, so only a single
+serialized record is held in memory instead of the whole output file.
+"""
+
+import os
+from typing import Any, Callable, Iterable, Optional
+
+import orjson
+
+def write_json_records(output_path: str, records: Iterable[Any],
+                       default: Optional[Callable[[Any], Any]] = None) -> int:
+    """
+    Write records as a JSON array indented by two spaces.
+
+    The output is byte-for-byte what orjson.dumps(list(records),
+    option=OPT_INDENT_2 | OPT_APPEND_NEWLINE) would produce. Records are
+    written to a temporary file next to output_path, which replaces it only
+    once every record was written; if records raises midway (e.g. a dropped
+    download), the previous file is left untouched.
+
+    Args:
+        output_path (str): Path of the JSON file to write
+        records (Iterable[Any]): Records to serialize, in order
+        default (Optional[Callable]): orjson default hook for non-native records
+
+    Returns:
+        int: Number of records written
+    """
+    count = 0
+    # Same directory, so os.replace is an atomic rename on the same filesystem
+    tmp_path = f'{output_path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(b'[')
+            for record in records:
+                f.write(b',\n  ' if count else b'\n  ')
+                # Nest the record one level deeper; JSON strings never contain raw newlines
+                f.write(orjson.dumps(record, default=default, option=orjson.OPT_INDENT_2).replace(b'\n', b'\n  '))
+                count += 1
+            f.write(b'\n]\n' if count else b']\n')
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return count
@@ -8,16 +8,17 @@ categories, then saves the data to a JSON file compatible with the existing data
 """
 
 import csv
-import json
+import io
 import logging
-import os
 import re
 import sys
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Tuple
 from urllib.parse import urlparse
 
 import requests
 
+from app.services.json_writer import write_json_records
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -29,6 +30,35 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Precompiled patterns used in the per-row parsing loop
+# Aliases: a.k.a. 'ALIAS', f.k.a. 'ALIAS', n.k.a. 'ALIAS', or bare like "a.k.a. BNC"
+_ALIAS_PATTERN = re.compile(
+    r'(?:a\.k\.a\.|f\.k\.a\.|n\.k\.a\.)\s*(?:[\'"]([^\'";]+)[\'"]|[\'"]?([^\'";,]+))',
+    re.IGNORECASE
+)
+_TRAIL_PUNCT_RE = re.compile(r'[\.;,]+$')
+_TITLE_RE = re.compile(r'^(Mr\.?|Mrs\.?|Ms\.?|Dr\.?)\s+', re.IGNORECASE)
+
+class SDNEntity:
+    """A compact record for one parsed SDN row."""
+    
+    __slots__ = ('name', 'aliases', 'category', 'source')
+    
+    def __init__(self, name: str, aliases: List[str], category: str, source: str):
+        self.name = name
+        self.aliases = aliases
+        self.category = category
+        self.source = source
+    
+    def to_dict(self) -> Dict[str, any]:
+        """Returns the record in the JSON layout used by the other source lists."""
+        return {
+            "name": self.name,
+            "aliases": self.aliases,
+            "category": self.category,
+            "source": self.source
+        }
+
 class OFACSDNScraper:
     """
     A scraper for OFAC SDN (Specially Designated Nationals) list that downloads
@@ -42,33 +72,6 @@ class OFACSDNScraper:
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/104.0.0.0 Safari/537.36'
         })
         
-    def download_sdn_csv(self) -> Optional[str]:
-        """
-        Download the SDN CSV file from OFAC website.
-        
-        Returns:
-            Optional[str]: Path to the downloaded CSV file, or None if download failed
-        """
-        try:
-            logger.info(f"Downloading SDN CSV from: {self.sdn_url}")
-            response = self.session.get(self.sdn_url, timeout=30)
-            response.raise_for_status()
-            
-            # Save to temporary file
-            csv_path = "sdn_temp.csv"
-            with open(csv_path, 'w', encoding='utf-8') as f:
-                f.write(response.text)
-            
-            logger.info(f"Successfully downloaded SDN CSV to: {csv_path}")
-            return csv_path
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to download SDN CSV: {e}")
-            return None
-        except Exception as e:
-            logger.error(f"Unexpected error downloading SDN CSV: {e}")
-            return None
-    
     def parse_name_and_aliases(self, alias_field: str) -> Tuple[str, List[str]]:
         """
         Parse aliases from the alias field (column 11).
@@ -90,40 +93,17 @@ class OFACSDNScraper:
         # Clean up the alias field
         alias_field = alias_field.strip()
         
-        aliases = []
-        
-        # Pattern to match aliases: a.k.a. 'ALIAS', f.k.a. 'ALIAS', n.k.a. 'ALIAS'
-        # Also handle cases without quotes
-        alias_pattern = r'(?:a\.k\.a\.|f\.k\.a\.|n\.k\.a\.)\s*[\'"]?([^\'";,]+)[\'"]?'
-        matches = re.findall(alias_pattern, alias_field, re.IGNORECASE)
+        # Ordered set of cleaned aliases, in the order they appear
+        aliases = {}
         
-        for match in matches:
-            alias = match.strip()
-            if alias and alias not in aliases:
-                # Remove any trailing punctuation
-                alias = re.sub(r'[\.;,]+$', '', alias).strip()
-                if alias:
-                    aliases.append(self.clean_name(alias))
+        for quoted, bare in _ALIAS_PATTERN.findall(alias_field):
+            # Remove any trailing punctuation
+            alias = _TRAIL_PUNCT_RE.sub('', (quoted or bare).strip()).strip()
+            if alias:
+                aliases[self.clean_name(alias)] = None
+        aliases.pop("", None)
         
-        # Also try a simpler pattern for cases like "a.k.a. BNC" without quotes
-        simple_pattern = r'(?:a\.k\.a\.|f\.k\.a\.|n\.k\.a\.)\s+([^;,\.]+)'
-        simple_matches = re.findall(simple_pattern, alias_field, re.IGNORECASE)
-        
-        for match in simple_matches:
-            alias = match.strip()
-            if alias and alias not in aliases:
-                # Remove any trailing punctuation
-                alias = re.sub(r'[\.;,]+$', '', alias).strip()
-                if alias:
-                    cleaned_alias = self.clean_name(alias)
-                    if cleaned_alias and cleaned_alias not in aliases:
-                        aliases.append(cleaned_alias)
-        
-        # Remove duplicates and empty strings
-        aliases = [alias for alias in aliases if alias]
-        aliases = list(dict.fromkeys(aliases))  # Remove duplicates while preserving order
-        
-        return "", aliases
+        return "", list(aliases)
     
     def clean_name(self, name: str) -> str:
         """
@@ -142,119 +122,111 @@ class OFACSDNScraper:
         name = name.strip('\'"')
         
         # Remove extra whitespace and normalize
-        name = re.sub(r'\s+', ' ', name.strip())
+        name = ' '.join(name.split())
         
-        # Remove common prefixes/suffixes that might be inconsistent
-        name = re.sub(r'^(Mr\.?|Mrs\.?|Ms\.?|Dr\.?)\s+', '', name, flags=re.IGNORECASE)
+        # Remove common prefixes/suffixes that might be inconsistent;
+        # only names starting with Mr/Mrs/Ms/Dr can carry one
+        if name[:2].casefold() in ('mr', 'ms', 'dr'):
+            name = _TITLE_RE.sub('', name)
         
         return name
     
-    def parse_csv_data(self, csv_path: str) -> List[Dict[str, any]]:
+    def parse_csv_data(self, lines: Iterable[str]) -> List[SDNEntity]:
         """
-        Parse the SDN CSV file and extract entity information.
+        Parse the SDN CSV data and extract entity information.
         
         Args:
-            csv_path (str): Path to the CSV file
+            lines (Iterable[str]): Lines of the SDN CSV, e.g. a streamed download
             
         Returns:
-            List[Dict[str, any]]: List of extracted entities
+            List[SDNEntity]: List of extracted entities
         """
         entities = []
         processed_count = 0
         skipped_count = 0
         
         try:
-            with open(csv_path, 'r', encoding='utf-8') as csvfile:
-                # Read CSV with proper handling
-                reader = csv.reader(csvfile)
+            # Read CSV with proper handling
+            reader = csv.reader(lines)
+            
+            logger.info("Starting to parse CSV data...")
+            
+            for row_num, row in enumerate(reader, 1):
+                if len(row) < 12:  # Need at least 12 columns for alias info
+                    continue
+                
+                # Extract data from columns
+                # Column 0: ent_num (entity number)
+                # Column 1: SDN_Name (primary name)
+                # Column 2: SDN_Type (entity type - individual, vessel, or empty for entities)
+                # Column 11: Aliases (a.k.a. information)
+                entity_type = row[2].strip().lower()
+                
+                # Map entity types - if column 2 is empty, it's usually an entity
+                if entity_type == "individual":
+                    category = "individual"
+                elif entity_type == "vessel":
+                    category = "vessel"  # Keep vessels separate
+                elif entity_type == "" or entity_type == "-0-":
+                    category = "entity"  # Empty usually means entity
+                else:
+                    # Skip unknown types
+                    skipped_count += 1
+                    continue
+                
+                # Only process individuals and entities (skip vessels for now)
+                if category not in ['individual', 'entity']:
+                    skipped_count += 1
+                    continue
+                
+                name_field = row[1].strip()
+                if not name_field:
+                    skipped_count += 1
+                    continue
+                
+                # Clean the primary name
+                primary_name = self.clean_name(name_field)
                 
-                logger.info("Starting to parse CSV data...")
+                if not primary_name:
+                    skipped_count += 1
+                    continue
                 
-                for row_num, row in enumerate(reader, 1):
-                    if len(row) < 12:  # Need at least 12 columns for alias info
-                        continue
-                    
-                    # Extract data from columns
-                    # Column 0: ent_num (entity number)
-                    # Column 1: SDN_Name (primary name)
-                    # Column 2: SDN_Type (entity type - individual, vessel, or empty for entities)
-                    # Column 11: Aliases (a.k.a. information)
-                    entity_type = row[2].strip().lower() if len(row) > 2 else ""
-                    
-                    # Map entity types - if column 2 is empty, it's usually an entity
-                    if entity_type == "individual":
-                        category = "individual"
-                    elif entity_type == "vessel":
-                        category = "vessel"  # Keep vessels separate
-                    elif entity_type == "" or entity_type == "-0-":
-                        category = "entity"  # Empty usually means entity
-                    else:
-                        # Skip unknown types
-                        skipped_count += 1
-                        continue
-                    
-                    # Only process individuals and entities (skip vessels for now)
-                    if category not in ['individual', 'entity']:
-                        skipped_count += 1
-                        continue
-                    
-                    name_field = row[1].strip() if len(row) > 1 else ""
-                    if not name_field:
-                        skipped_count += 1
-                        continue
-                    
-                    # Clean the primary name
-                    primary_name = self.clean_name(name_field)
-                    
-                    if not primary_name:
-                        skipped_count += 1
-                        continue
-                    
-                    # Extract aliases from column 11
-                    aliases = []
-                    alias_field = row[11].strip() if len(row) > 11 else ""
-                    if alias_field and alias_field != "-0-":
-                        # Parse aliases from the alias field
-                        _, parsed_aliases = self.parse_name_and_aliases(alias_field)
-                        aliases = parsed_aliases
-                    
-                    # Create entity record
-                    entity = {
-                        "name": primary_name,
-                        "aliases": aliases,
-                        "category": category,
-                        "source": "US OFAC"
-                    }
-                    
-                    entities.append(entity)
-                    processed_count += 1
-                    
-                    # Log progress every 1000 records
-                    if processed_count % 1000 == 0:
-                        logger.info(f"Processed {processed_count} records...")
+                # Extract aliases from column 11
+                aliases = []
+                alias_field = row[11].strip()
+                if alias_field and alias_field != "-0-":
+                    # Parse aliases from the alias field
+                    _, parsed_aliases = self.parse_name_and_aliases(alias_field)
+                    aliases = parsed_aliases
                 
-                logger.info(f"Parsing complete. Processed: {processed_count}, Skipped: {skipped_count}")
+                entities.append(SDNEntity(primary_name, aliases, category, "US OFAC"))
+                processed_count += 1
                 
+                # Log progress every 1000 records
+                if processed_count % 1000 == 0:
+                    logger.info(f"Processed {processed_count} records...")
+            
+            logger.info(f"Parsing complete. Processed: {processed_count}, Skipped: {skipped_count}")
+            
         except Exception as e:
             logger.error(f"Error parsing CSV data: {e}")
             return []
         
         return entities
     
-    def save_to_json(self, entities: List[Dict[str, any]], output_path: str = "ofac_sdn_list.json") -> bool:
+    def save_to_json(self, entities: List[SDNEntity], output_path: str = "ofac_sdn_list.json") -> bool:
         """
         Save the extracted entities to a JSON file.
         
         Args:
-            entities (List[Dict[str, any]]): List of entities to save
+            entities (List[SDNEntity]): List of entities to save
             output_path (str): Path to save the JSON file
             
         Returns:
             bool: True if successful, False otherwise
         """
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(entities, f, indent=2, ensure_ascii=False)
+            write_json_records(output_path, entities, default=SDNEntity.to_dict)
             
             logger.info(f"Successfully saved {len(entities)} entities to: {output_path}")
             return True
@@ -263,18 +235,6 @@ class OFACSDNScraper:
             logger.error(f"Error saving JSON file: {e}")
             return False
     
-    def cleanup_temp_files(self):
-        """Clean up temporary files created during processing."""
-        temp_files = ["sdn_temp.csv"]
-        
-        for file_path in temp_files:
-            if os.path.exists(file_path):
-                try:
-                    os.remove(file_path)
-                    logger.info(f"Cleaned up temporary file: {file_path}")
-                except Exception as e:
-                    logger.warning(f"Could not remove temporary file {file_path}: {e}")
-    
     def scrape_and_save(self, output_path: str = "ofac_sdn_list.json") -> bool:
         """
         Main method to scrape OFAC SDN data and save to JSON.
@@ -288,14 +248,21 @@ class OFACSDNScraper:
         try:
             logger.info("Starting OFAC SDN scraping process...")
             
-            # Download CSV file
-            csv_path = self.download_sdn_csv()
-            if not csv_path:
-                logger.error("Failed to download SDN CSV file")
-                return False
+            # Stream the CSV straight from the response into the parser
+            logger.info(f"Downloading SDN CSV from: {self.sdn_url}")
+            with self.session.get(self.sdn_url, stream=True, timeout=30) as response:
+                response.raise_for_status()
+                # Decode the body through a large buffer; newline='' leaves line
+                # splitting (and newlines inside quoted fields) to csv.reader
+                response.raw.decode_content = True
+                response.raw.auto_close = False
+                lines = io.TextIOWrapper(
+                    io.BufferedReader(response.raw, buffer_size=1 << 20),
+                    encoding=response.encoding or 'utf-8',
+                    newline=''
+                )
+                entities = self.parse_csv_data(lines)
             
-            # Parse CSV data
-            entities = self.parse_csv_data(csv_path)
             if not entities:
                 logger.error("No entities extracted from CSV")
                 return False
@@ -303,9 +270,6 @@ class OFACSDNScraper:
             # Save to JSON
             success = self.save_to_json(entities, output_path)
             
-            # Cleanup temporary files
-            self.cleanup_temp_files()
-            
             if success:
                 logger.info(f"OFAC SDN scraping completed successfully. Total entities: {len(entities)}")
                 return True
@@ -313,9 +277,11 @@ class OFACSDNScraper:
                 logger.error("Failed to save entities to JSON")
                 return False
                 
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to download SDN CSV: {e}")
+            return False
         except Exception as e:
             logger.error(f"Unexpected error during scraping: {e}")
-            self.cleanup_temp_files()
             return False
 
 
@@ -10,17 +10,21 @@ processes the data, and outputs a structured JSON file. It is designed to be
 resilient to changes in link text, filenames, and the addition of new documents.
 """
 
-import json
 import logging
 import os
 import re
 import sys
-from typing import Dict, List, Optional
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 
 import pdfplumber
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+
+from app.services.json_writer import write_json_records
 
 # Configure logging
 logging.basicConfig(
@@ -33,6 +37,75 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Precompiled patterns used while discovering PDFs and parsing names
+_PDF_HREF_RE = re.compile(r'\.pdf$', re.IGNORECASE)
+_TERRORIST_KEYWORDS_RE = re.compile(r'terrorist|first[-_]schedule|annexurea')
+_PAREN_RE = re.compile(r'\(.*?\)')
+_PAREN_CONTENT_RE = re.compile(r'\((.*?)\)')
+_ALIAS_SPLIT_RE = re.compile(r'[,;]')
+_WORD_RE = re.compile(r'\b[A-Za-z]+\b')
+_QAIDA_RE = re.compile(r'qaida', re.IGNORECASE)
+_QAEDA_RE = re.compile(r'qaeda', re.IGNORECASE)
+
+@lru_cache(maxsize=8192)
+def parse_name_and_aliases(raw_name_string: str) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Cleans a raw string, extracts the primary name, and derives a rich set of aliases
+    including from slashes, parentheses, acronyms, and spelling variations.
+
+    Results are memoized, since the same entry often appears in several PDFs;
+    aliases are returned as a tuple so cached results cannot be mutated.
+    """
+    if not isinstance(raw_name_string, str):
+        return "", ()
+
+    # 1. Initial Cleaning
+    clean_str = ' '.join(raw_name_string.split())
+    
+    # 2. Extract Primary Name (text before the first slash or parenthesis)
+    primary_name = clean_str.split('/', 1)[0].split('(', 1)[0].strip()
+    
+    # 3. Extract Aliases from Slashes and Parentheses
+    aliases = set()
+    # Add all parts separated by slashes
+    for part in clean_str.split('/'):
+        # Remove any nested parentheses for the alias list
+        alias = (_PAREN_RE.sub('', part) if '(' in part else part).strip()
+        if len(alias) > 2:
+            aliases.add(alias)
+    
+    # Add all parts found inside parentheses
+    paren_matches = _PAREN_CONTENT_RE.findall(clean_str) if '(' in clean_str else []
+    for match in paren_matches:
+        # Can have multiple aliases inside, separated by comma or semicolon
+        for part in _ALIAS_SPLIT_RE.split(match):
+            if len(part.strip()) > 2:
+                aliases.add(part.strip())
+
+    # 4. Generate Acronym for the primary name
+    words = _WORD_RE.findall(primary_name)
+    stop_words = {'of', 'the', 'and', 'ul', 'e', 'in'}
+    acronym = "".join([word[0] for word in words if word.lower() not in stop_words]).upper()
+    if len(acronym) >= 2:
+        aliases.add(acronym)
+
+    # 5. Generate Spelling Variations (e.g., Al-Qaida vs Al-Qaeda)
+    spelling_variations = set()
+    for alias in aliases.copy(): # Iterate over a copy as we modify the set
+        if 'qaida' in alias.lower():
+            spelling_variations.add(_QAIDA_RE.sub('qaeda', alias))
+        if 'qaeda' in alias.lower():
+            spelling_variations.add(_QAEDA_RE.sub('qaida', alias))
+    aliases.update(spelling_variations)
+
+    # 6. Final Cleanup
+    # Remove the primary name itself from the alias list
+    aliases.discard(primary_name)
+    # Remove any aliases that are substrings of the primary name
+    aliases = {alias for alias in aliases if alias.lower() not in primary_name.lower()}
+    
+    return primary_name, tuple(sorted(aliases))
+
 class MHABannedOrgScraper:
     """
     A resilient scraper for MHA banned organizations data that dynamically
@@ -60,14 +133,15 @@ class MHABannedOrgScraper:
         try:
             response = self.session.get(self.banned_orgs_url, timeout=30)
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
+            # Only build the tree for PDF anchors; the rest of the page is never read
+            soup = BeautifulSoup(response.content, 'html.parser', parse_only=SoupStrainer('a', href=_PDF_HREF_RE))
         except requests.RequestException as e:
             logger.error(f"Failed to fetch MHA page: {e}")
             return []
 
         found_pdfs = []
         # Find all anchor tags with an href attribute ending in '.pdf'
-        pdf_links = soup.find_all('a', href=re.compile(r'\.pdf$', re.IGNORECASE))
+        pdf_links = soup.find_all('a', href=_PDF_HREF_RE)
 
         if not pdf_links:
             logger.error("No PDF links found on the page.")
@@ -82,7 +156,7 @@ class MHABannedOrgScraper:
             
             category = 'uncategorized'
             # Categorize based on keywords
-            if 'terrorist' in search_text or 'first-schedule' in search_text or 'first_schedule' in search_text or 'annexurea' in search_text:
+            if _TERRORIST_KEYWORDS_RE.search(search_text):
                 category = 'terrorist'
             elif 'unlawful' in search_text:
                 category = 'unlawful'
@@ -104,10 +178,13 @@ class MHABannedOrgScraper:
             response = self.session.get(url, timeout=60)
             response.raise_for_status()
             
-            filename = f"{category}_{os.path.basename(urlparse(url).path)}"
-            filepath = os.path.join('/tmp', filename) # Save to a temporary directory
+            # Downloads run concurrently and different URLs can share a basename,
+            # so give every download its own temporary file
+            fd, filepath = tempfile.mkstemp(
+                prefix=f"{category}_", suffix=f"_{os.path.basename(urlparse(url).path)}"
+            )
 
-            with open(filepath, 'wb') as f:
+            with os.fdopen(fd, 'wb') as f:
                 f.write(response.content)
             logger.info(f"Successfully downloaded to: {filepath}")
             return filepath
@@ -121,56 +198,8 @@ class MHABannedOrgScraper:
         Cleans a raw string, extracts the primary name, and derives a rich set of aliases
         including from slashes, parentheses, acronyms, and spelling variations.
         """
-        if not isinstance(raw_name_string, str):
-            return "", []
-
-        # 1. Initial Cleaning
-        clean_str = re.sub(r'\s+', ' ', raw_name_string).strip()
-        
-        # 2. Extract Primary Name (text before the first slash or parenthesis)
-        primary_name_match = re.match(r'^(.*?)(?:\s*\(|\s*\/|$)', clean_str)
-        primary_name = primary_name_match.group(1).strip() if primary_name_match else clean_str
-        
-        # 3. Extract Aliases from Slashes and Parentheses
-        aliases = set()
-        # Add all parts separated by slashes
-        for part in clean_str.split('/'):
-            # Remove any nested parentheses for the alias list
-            alias = re.sub(r'\(.*?\)', '', part).strip()
-            if len(alias) > 2:
-                aliases.add(alias)
-        
-        # Add all parts found inside parentheses
-        paren_matches = re.findall(r'\((.*?)\)', clean_str)
-        for match in paren_matches:
-            # Can have multiple aliases inside, separated by comma or semicolon
-            for part in re.split(r'[,;]', match):
-                if len(part.strip()) > 2:
-                    aliases.add(part.strip())
-
-        # 4. Generate Acronym for the primary name
-        words = re.findall(r'\b[A-Za-z]+\b', primary_name)
-        stop_words = {'of', 'the', 'and', 'ul', 'e', 'in'}
-        acronym = "".join([word[0] for word in words if word.lower() not in stop_words]).upper()
-        if len(acronym) >= 2:
-            aliases.add(acronym)
-
-        # 5. Generate Spelling Variations (e.g., Al-Qaida vs Al-Qaeda)
-        spelling_variations = set()
-        for alias in aliases.copy(): # Iterate over a copy as we modify the set
-            if 'qaida' in alias.lower():
-                spelling_variations.add(re.sub(r'qaida', 'qaeda', alias, flags=re.IGNORECASE))
-            if 'qaeda' in alias.lower():
-                spelling_variations.add(re.sub(r'qaeda', 'qaida', alias, flags=re.IGNORECASE))
-        aliases.update(spelling_variations)
-
-        # 6. Final Cleanup
-        # Remove the primary name itself from the alias list
-        aliases.discard(primary_name)
-        # Remove any aliases that are substrings of the primary name
-        aliases = {alias for alias in aliases if alias.lower() not in primary_name.lower()}
-        
-        return primary_name, sorted(list(aliases))
+        primary_name, aliases = parse_name_and_aliases(raw_name_string)
+        return primary_name, list(aliases)
 
 
     def extract_data_from_pdf(self, pdf_path: str, category: str) -> List[Dict]:
@@ -207,27 +236,27 @@ class MHABannedOrgScraper:
         logger.info(f"Extracted {len(organizations)} organizations from {pdf_path}")
         return organizations
 
-    def deduplicate_and_save(self, organizations: List[Dict]):
-        """Deduplicates a list of organizations and saves to JSON."""
+    def deduplicate_and_save(self, organizations: List[Dict]) -> bool:
+        """Deduplicates a list of organizations and saves to JSON; returns True if the file was written."""
         if not organizations:
             logger.warning("No organizations were extracted. Nothing to save.")
-            return
+            return False
 
         unique_orgs = {org['name'].lower(): org for org in organizations}
-        deduplicated_list = list(unique_orgs.values())
         
-        logger.info(f"Deduplicated {len(organizations)} -> {len(deduplicated_list)} organizations.")
+        logger.info(f"Deduplicated {len(organizations)} -> {len(unique_orgs)} organizations.")
         
         output_filename = 'mha_banned_list.json'
         try:
-            with open(output_filename, 'w', encoding='utf-8') as f:
-                json.dump(deduplicated_list, f, ensure_ascii=False, indent=2)
-            logger.info(f"Successfully saved {len(deduplicated_list)} organizations to {output_filename}")
+            write_json_records(output_filename, unique_orgs.values())
+            logger.info(f"Successfully saved {len(unique_orgs)} organizations to {output_filename}")
+            return True
         except IOError as e:
             logger.error(f"Failed to save JSON file: {e}")
+            return False
 
-    def run(self):
-        """Main execution method to run the full scraping pipeline."""
+    def run(self) -> bool:
+        """Main execution method to run the full scraping pipeline; returns True on success."""
         logger.info("="*50)
         logger.info("Starting MHA Banned Organizations Scraper (Resilient Mode)")
         logger.info("="*50)
@@ -236,30 +265,42 @@ class MHABannedOrgScraper:
         discovered_pdfs = self.discover_and_categorize_pdfs()
         if not discovered_pdfs:
             logger.error("Scraper run failed: No PDFs were discovered.")
-            return
+            return False
 
-        all_organizations = []
-        temp_files_to_clean = []
-
-        # 2. Process each categorized PDF
+        # 2. Download every categorized PDF concurrently
+        pdfs_to_fetch = []
+        seen_urls = set()
         for pdf_info in discovered_pdfs:
             if pdf_info['category'] == 'uncategorized':
                 logger.critical(f"CRITICAL: Found new, uncategorized PDF '{pdf_info['text']}' at {pdf_info['url']}. Manual review required. Skipping file.")
                 continue
-
-            # Download the PDF
-            local_pdf_path = self.download_pdf(pdf_info['url'], pdf_info['category'])
-            if not local_pdf_path:
+            # The same document is often linked more than once on the page
+            if pdf_info['url'] in seen_urls:
                 continue
-            
-            temp_files_to_clean.append(local_pdf_path)
-            
-            # Extract data from the downloaded PDF
-            orgs = self.extract_data_from_pdf(local_pdf_path, pdf_info['category'])
-            all_organizations.extend(orgs)
+            seen_urls.add(pdf_info['url'])
+            pdfs_to_fetch.append(pdf_info)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            local_pdf_paths = list(executor.map(
+                lambda pdf_info: self.download_pdf(pdf_info['url'], pdf_info['category']),
+                pdfs_to_fetch
+            ))
+
+        downloaded = [
+            (local_pdf_path, pdf_info['category'])
+            for local_pdf_path, pdf_info in zip(local_pdf_paths, pdfs_to_fetch)
+            if local_pdf_path
+        ]
+        temp_files_to_clean = [local_pdf_path for local_pdf_path, _ in downloaded]
+
+        # Extract data from the downloaded PDFs in parallel, keeping page order
+        all_organizations = []
+        with ProcessPoolExecutor() as executor:
+            for orgs in executor.map(_extract_pdf_worker, downloaded):
+                all_organizations.extend(orgs)
 
         # 3. Deduplicate and save the final combined list
-        self.deduplicate_and_save(all_organizations)
+        saved = self.deduplicate_and_save(all_organizations)
 
         # 4. Clean up temporary files
         logger.info("Cleaning up temporary PDF files...")
@@ -273,6 +314,12 @@ class MHABannedOrgScraper:
         logger.info("="*50)
         logger.info("Scraping pipeline finished.")
         logger.info("="*50)
+        return saved
+
+def _extract_pdf_worker(job) -> List[Dict]:
+    """Extracts one downloaded PDF in a worker process."""
+    pdf_path, category = job
+    return MHABannedOrgScraper().extract_data_from_pdf(pdf_path, category)
 
 def main():
     """Main entry point."""
@@ -1,9 +1,9 @@
 import os
 import sys
-import json
 import logging
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from datetime import datetime
+import orjson
+from sqlalchemy import create_engine, delete, insert
 
 # Add project root to the path to allow imports from 'app'
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -11,7 +11,8 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 # Import the database models
-from app.models.entity import Base, Entity, Alias, Sanction
+from app.db.session import tune_sqlite_engine
+from app.models.entity import Base, Entity, Alias, Sanction, normalize_name
 
 # --- Configuration ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -28,17 +29,9 @@ def main():
     logging.info(f"Attempting to connect to database: {DATABASE_URL}")
 
     engine = create_engine(DATABASE_URL)
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    session = SessionLocal()
+    tune_sqlite_engine(engine)
 
     try:
-        logging.info("Clearing existing data from database...")
-        session.query(Sanction).delete()
-        session.query(Alias).delete()
-        session.query(Entity).delete()
-        session.commit()
-        logging.info("Database tables cleared successfully.")
-
         logging.info("Processing data files and preparing batch...")
         
         files_to_process = {
@@ -47,7 +40,12 @@ def main():
             'un_consolidated_list.json': 'UNSC'
         }
         
-        all_objects_to_add = []
+        # Plain row dicts for Core inserts; aliases are kept per entity row
+        # until the entity ids come back from the insert
+        entity_rows = []
+        aliases_by_entity = []
+        # One load timestamp for every row instead of a clock read per column default
+        loaded_at = datetime.utcnow()
         items_processed = 0
         items_skipped = 0
 
@@ -57,8 +55,8 @@ def main():
                 continue
 
             logging.info(f"Loading data from {filename}...")
-            with open(filename, 'r') as f:
-                data = json.load(f)
+            with open(filename, 'rb') as f:
+                data = orjson.loads(f.read())
             
             for item in data:
                 items_processed += 1
@@ -75,39 +73,58 @@ def main():
                     primary_name = None
 
                 if primary_name:
-                    new_entity = Entity(
-                        name=primary_name,
-                        type=item.get('list_type') or item.get('category', 'organization'),
-                        source=source_body
-                    )
-                    
+                    alias_names = []
                     if item.get('aliases'):
                         for alias_name in item['aliases']:
                             if isinstance(alias_name, str):
-                                new_alias = Alias(alias_name=alias_name, entity=new_entity)
-                                all_objects_to_add.append(new_alias)
+                                alias_names.append(alias_name)
                             else:
                                 logging.warning(f"Skipping non-string alias for entity {primary_name}: {alias_name}")
 
-                    all_objects_to_add.append(new_entity)
+                    # Core inserts bypass the ORM validator, so set name_norm here
+                    entity_rows.append({
+                        'name': primary_name,
+                        'name_norm': normalize_name(primary_name),
+                        'type': item.get('list_type') or item.get('category', 'organization'),
+                        'source': source_body,
+                        'date_added': loaded_at,
+                        'date_updated': loaded_at
+                    })
+                    aliases_by_entity.append(alias_names)
                 else:
                     items_skipped += 1
                     logging.warning(f"Skipping record due to missing primary name. Record: {item}")
 
         logging.info(f"Total items processed: {items_processed}. Items skipped: {items_skipped}.")
-        logging.info(f"Batch prepared with {len(all_objects_to_add)} total objects.")
+        logging.info(f"Batch prepared with {len(entity_rows)} entities and {sum(map(len, aliases_by_entity))} aliases.")
 
+        # Clear and repopulate in one transaction so a failed load keeps the old data
         logging.info("Committing batch to the database. This may take a moment...")
-        session.add_all(all_objects_to_add)
-        session.commit()
+        with engine.begin() as conn:
+            conn.execute(delete(Sanction))
+            conn.execute(delete(Alias))
+            conn.execute(delete(Entity))
+            logging.info("Database tables cleared successfully.")
+
+            entity_ids = conn.execute(
+                insert(Entity).returning(Entity.id, sort_by_parameter_order=True),
+                entity_rows
+            ).scalars().all()
+            alias_rows = [
+                {'alias_name': alias_name, 'entity_id': entity_id, 'date_added': loaded_at}
+                for entity_id, alias_names in zip(entity_ids, aliases_by_entity)
+                for alias_name in alias_names
+            ]
+            if alias_rows:
+                conn.execute(insert(Alias), alias_rows)
         
         logging.info(f"--- Successfully finished populating the database ---")
 
     except Exception as e:
         logging.error(f"An error occurred during ingestion: {e}")
-        session.rollback()
     finally:
-        session.close()
+        # Closing the last connection checkpoints the WAL back into the database file
+        engine.dispose()
 
 
 if __name__ == "__main__":
@@ -3,61 +3,139 @@ import logging
 import os
 import sys
 import pandas as pd
-from sqlalchemy import create_engine, func
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import sessionmaker
-from app.models.entity import Base, Entity, Relationship
+from app.db.session import tune_sqlite_engine
+from app.models.entity import Base, Entity, Relationship, normalize_name
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+CSV_COLUMNS = ['COMPANY_NAME', 'DIRECTORS']  # Assume column names; directors are comma-separated
+CSV_CHUNK_SIZE = 10000
+ENTITY_BATCH_SIZE = 500
+
+# Dialect INSERTs that support ON CONFLICT DO NOTHING
+DIALECT_INSERT = {'sqlite': sqlite.insert, 'postgresql': postgresql.insert}
+
+def iter_company_rows(csv_file):
+    """Yields (company_name, director_parts) per CSV row, reading the file in chunks."""
+    for chunk in pd.read_csv(csv_file, usecols=lambda column: column in CSV_COLUMNS,
+                             dtype=str, keep_default_na=False, chunksize=CSV_CHUNK_SIZE):
+        # A missing column reads as empty strings, like row.get() did
+        chunk = chunk.reindex(columns=CSV_COLUMNS, fill_value='')
+        yield from zip(chunk['COMPANY_NAME'], chunk['DIRECTORS'].str.split(','))
+
 def main(csv_file='company_master_data.csv'):
     database_url = os.getenv('DATABASE_URL', 'sqlite:///./project_sentinel.db')
     logging.info(f'Connecting to database: {database_url}')
     engine = create_engine(database_url)
+    tune_sqlite_engine(engine)
     Base.metadata.create_all(engine)
+    # create_all only indexes tables it creates; add any index missing from an existing table
+    for index in Relationship.__table__.indexes:
+        index.create(engine, checkfirst=True)
     Session = sessionmaker(bind=engine)
     
     logging.info(f'Reading CSV file: {csv_file}')
-    df = pd.read_csv(csv_file)
     
     with Session() as session:
-        for index, row in df.iterrows():
-            company_name = row.get('COMPANY_NAME')  # Assume column name
+        # Preload ids for existing MCA-style entities so the row loop
+        # resolves names with dict lookups instead of SELECTs
+        entity_ids = {'organization': {}, 'person': {}}
+        for entity_id, name_norm, entity_type in session.execute(
+            select(Entity.id, Entity.name_norm, Entity.type)
+            .where(Entity.type.in_(entity_ids.keys()))
+            .order_by(Entity.id)
+        ):
+            entity_ids[entity_type].setdefault(name_norm, entity_id)
+        
+        # New entities and the director links that need their ids are queued
+        # and written in batches, instead of one INSERT round trip per entity
+        pending_entities = {}
+        pending_links = []
+        dialect_insert = DIALECT_INSERT.get(engine.dialect.name)
+        if dialect_insert is None:
+            logging.info(f'No ON CONFLICT support for {engine.dialect.name}; checking for existing links before inserting')
+            insert_ignoring_duplicates = None
+        else:
+            insert_ignoring_duplicates = dialect_insert(Relationship).on_conflict_do_nothing(
+                index_elements=['from_entity_id', 'to_entity_id', 'relation_type']
+            )
+        
+        def insert_links(links):
+            """Inserts (from_id, to_id) 'Director Of' links, skipping ones that already exist."""
+            if insert_ignoring_duplicates is not None:
+                session.execute(insert_ignoring_duplicates, [
+                    {'from_entity_id': from_id, 'to_entity_id': to_id, 'relation_type': 'Director Of'}
+                    for from_id, to_id in links
+                ])
+                return
+            # Portable fallback: look up which of this batch's links exist, then insert the rest
+            links = set(links)
+            existing = set(session.execute(
+                select(Relationship.from_entity_id, Relationship.to_entity_id)
+                .where(Relationship.relation_type == 'Director Of')
+                .where(Relationship.from_entity_id.in_({from_id for from_id, _ in links}))
+                .where(Relationship.to_entity_id.in_({to_id for _, to_id in links}))
+            ).tuples())
+            new_links = links - existing
+            if new_links:
+                session.execute(insert(Relationship), [
+                    {'from_entity_id': from_id, 'to_entity_id': to_id, 'relation_type': 'Director Of'}
+                    for from_id, to_id in new_links
+                ])
+        
+        def queue_entity(name, entity_type):
+            name_norm = normalize_name(name)
+            key = (entity_type, name_norm)
+            if name_norm not in entity_ids[entity_type] and key not in pending_entities:
+                pending_entities[key] = Entity(name=name, type=entity_type, source='MCA India')
+            return name_norm
+        
+        def flush_pending():
+            session.add_all(pending_entities.values())
+            session.flush()
+            for (entity_type, name_norm), entity in pending_entities.items():
+                entity_ids[entity_type][name_norm] = entity.id
+            pending_entities.clear()
+            
+            # Create relationships if not exists; the unique index drops duplicates
+            if pending_links:
+                insert_links([
+                    (entity_ids['person'][director_norm], entity_ids['organization'][company_norm])
+                    for director_norm, company_norm in pending_links
+                ])
+            pending_links.clear()
+        
+        for index, (company_name, director_parts) in enumerate(iter_company_rows(csv_file)):
             if not company_name:
                 logging.warning(f'Skipping row {index}: No company name')
                 continue
             
-            # Check if company exists
-            company = session.query(Entity).filter(func.lower(Entity.name) == company_name.lower(), Entity.type == 'organization').first()
-            if not company:
-                company = Entity(name=company_name, type='organization', source='MCA India')
-                session.add(company)
-                session.flush()
+            # Find or create the company
+            company_norm = queue_entity(company_name, 'organization')
             
-            # Assume directors are in a column 'DIRECTORS' comma-separated
-            directors_str = row.get('DIRECTORS', '')
-            director_names = [name.strip() for name in directors_str.split(',') if name.strip()]
+            director_names = [name.strip() for name in director_parts if name.strip()]
             
             for dir_name in director_names:
-                director = session.query(Entity).filter(func.lower(Entity.name) == dir_name.lower(), Entity.type == 'person').first()
-                if not director:
-                    director = Entity(name=dir_name, type='person', source='MCA India')
-                    session.add(director)
-                    session.flush()
-                
-                # Create relationship if not exists
-                rel = session.query(Relationship).filter(
-                    Relationship.from_entity_id == director.id,
-                    Relationship.to_entity_id == company.id,
-                    Relationship.relation_type == 'Director Of'
-                ).first()
-                if not rel:
-                    rel = Relationship(from_entity_id=director.id, to_entity_id=company.id, relation_type='Director Of')
-                    session.add(rel)
+                pending_links.append((queue_entity(dir_name, 'person'), company_norm))
             
-            session.commit()
+            if len(pending_entities) >= ENTITY_BATCH_SIZE:
+                flush_pending()
+            if (index + 1) % 1000 == 0:
+                # Keep the identity map small; everything is committed once at the end
+                flush_pending()
+                session.flush()
+                session.expunge_all()
             if (index + 1) % 100 == 0:
                 logging.info(f'Processed {index + 1} rows')
+        
+        flush_pending()
+        session.commit()
     
+    # Closing the last connection checkpoints the WAL back into the database file
+    engine.dispose()
     logging.info('Ingestion completed')
 
 if __name__ == '__main__':
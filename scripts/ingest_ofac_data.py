@@ -2,48 +2,63 @@
 import logging
 import pandas as pd
 import re
-import json
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from app.services.json_writer import write_json_records
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 CSV_URL = 'https://www.treasury.gov/ofac/downloads/sdn.csv'
 OUTPUT_JSON = 'ofac_sdn_list.json'
 
+# One pooled session per run: keep-alive, gzip (requests' default Accept-Encoding)
+# and retries with backoff for transient network or 5xx failures
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504))))
+
+# Columns based on OFAC format: 0: ent_num, 1: sdn_name, 2: sdn_type, etc.
+COLUMNS = ['ent_num', 'sdn_name', 'sdn_type', 'program', 'title', 'call_sign', 'vsl_type', 'tonnage', 'grt', 'vsl_flag', 'vsl_owner', 'remarks']
+CHUNK_SIZE = 5000
+
+ALIAS_PATTERN = re.compile(r'\baka (.+?)\b', re.IGNORECASE)
+
+# Extracts the 'aka' aliases for the whole remarks column in one pass
 def parse_aliases(remarks):
-    if pd.isna(remarks):
-        return []
-    aliases = re.findall(r'\baka (.+?)\b', remarks, re.IGNORECASE)
-    return [alias.strip() for alias in aliases if alias.strip()]
+    matches = remarks.fillna('').str.findall(ALIAS_PATTERN)
+    return [[alias.strip() for alias in found if alias.strip()] for found in matches]
+
+# Yields one record per CSV row, reading the file a chunk of rows at a time
+def read_records(csv_file):
+    processed = 0
+    for df in pd.read_csv(csv_file, header=None, names=COLUMNS, dtype=str, chunksize=CHUNK_SIZE):
+        # Walk the three columns we need directly; iterrows boxes every row into a Series
+        rows = zip(df['sdn_name'], df['sdn_type'], parse_aliases(df['remarks']))
+        for primary_name, sdn_type, aliases in rows:
+            category = sdn_type.lower() if pd.notna(sdn_type) else 'unknown'
+            
+            if primary_name:
+                yield {
+                    'primary_name': primary_name,
+                    'aliases': aliases,
+                    'category': category,
+                    'source': 'US OFAC'
+                }
+            
+            processed += 1
+            if processed % 1000 == 0:
+                logging.info(f'Processed {processed} records')
+    
+    logging.info(f'Processed {processed} total records')
 
 def main():
     logging.info('Downloading OFAC SDN List CSV...')
-    df = pd.read_csv(CSV_URL, header=None)
-    # Columns based on OFAC format: 0: ent_num, 1: sdn_name, 2: sdn_type, etc.
-    df.columns = ['ent_num', 'sdn_name', 'sdn_type', 'program', 'title', 'call_sign', 'vsl_type', 'tonnage', 'grt', 'vsl_flag', 'vsl_owner', 'remarks']
-    
-    records = []
-    total_records = len(df)
-    
-    for index, row in df.iterrows():
-        primary_name = row['sdn_name']
-        category = row['sdn_type'].lower() if pd.notna(row['sdn_type']) else 'unknown'
-        aliases = parse_aliases(row['remarks'])
-        
-        if primary_name:
-            records.append({
-                'primary_name': primary_name,
-                'aliases': aliases,
-                'category': category,
-                'source': 'US OFAC'
-            })
-        
-        if (index + 1) % 1000 == 0:
-            logging.info(f'Processed {index + 1}/{total_records} records')
-    
-    logging.info(f'Processed {total_records} total records')
-    
-    with open(OUTPUT_JSON, 'w', encoding='utf-8') as f:
-        json.dump(records, f, ensure_ascii=False, indent=2)
+    # Parse the response as it arrives and write each record straight out,
+    # so neither the CSV nor the record list is ever held in full
+    with SESSION.get(CSV_URL, stream=True, timeout=60) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True
+        write_json_records(OUTPUT_JSON, read_records(response.raw))
     
     logging.info(f'Data saved to {OUTPUT_JSON}')
 
@@ -1,79 +1,85 @@
 #!/usr/bin/env python3
 import logging
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import xml.etree.ElementTree as ET
-import json
+from itertools import chain
+from app.services.json_writer import write_json_records
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 XML_URL = 'https://scsanctions.un.org/resources/xml/en/consolidated.xml'
 OUTPUT_JSON = 'un_consolidated_list.json'
 
+# One pooled session per run: keep-alive, gzip (requests' default Accept-Encoding)
+# and retries with backoff for transient network or 5xx failures
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504))))
+
+INDIVIDUAL_NAME_TAGS = ('FIRST_NAME', 'SECOND_NAME', 'THIRD_NAME', 'FOURTH_NAME')
+ENTITY_NAME_TAGS = ('FIRST_NAME',)
+
+# Reads one INDIVIDUAL/ENTITY element in a single walk over its children
+def parse_record(record, name_tags, alias_tag):
+    fields = {}
+    aliases = []
+    for child in record:
+        if child.tag == alias_tag:
+            alias_name = child.find('ALIAS_NAME')
+            if alias_name is not None and alias_name.text:
+                aliases.append(alias_name.text)
+        else:
+            # Keep the first occurrence, as Element.find would
+            fields.setdefault(child.tag, child.text)
+    
+    primary_name = ' '.join([fields[tag] for tag in name_tags if fields.get(tag)]).strip()
+    orig_script = fields.get('NAME_ORIGINAL_SCRIPT')
+    if orig_script and orig_script not in aliases:
+        aliases.append(orig_script)
+    return primary_name, aliases
+
 def main():
     logging.info('Downloading UN Consolidated Sanctions List XML...')
-    response = requests.get(XML_URL)
-    response.raise_for_status()
-    xml_content = response.content
-    
-    logging.info('Parsing XML...')
-    root = ET.fromstring(xml_content)
-    
-    records = []
-    individual_count = 0
-    entity_count = 0
-    
-    # Process INDIVIDUALS
-    for individual in root.findall('.//INDIVIDUAL'):
-        first_name = individual.find('FIRST_NAME').text if individual.find('FIRST_NAME') is not None else ''
-        second_name = individual.find('SECOND_NAME').text if individual.find('SECOND_NAME') is not None else ''
-        third_name = individual.find('THIRD_NAME').text if individual.find('THIRD_NAME') is not None else ''
-        fourth_name = individual.find('FOURTH_NAME').text if individual.find('FOURTH_NAME') is not None else ''
-        primary_name = ' '.join([name for name in [first_name, second_name, third_name, fourth_name] if name]).strip()
+    # Closing the streamed response hands its connection back to the pool
+    with SESSION.get(XML_URL, stream=True, timeout=60) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True
         
-        aliases = []
-        for alias in individual.findall('INDIVIDUAL_ALIAS'):
-            alias_name = alias.find('ALIAS_NAME').text if alias.find('ALIAS_NAME') is not None else ''
-            if alias_name:
-                aliases.append(alias_name)
-        orig_script = individual.find('NAME_ORIGINAL_SCRIPT').text if individual.find('NAME_ORIGINAL_SCRIPT') is not None else ''
-        if orig_script and orig_script not in aliases:
-            aliases.append(orig_script)
+        logging.info('Parsing XML...')
+        individual_records = []
+        entity_records = []
         
-        if primary_name:
-            records.append({
-                'primary_name': primary_name,
-                'aliases': aliases,
-                'category': 'individual',
-                'source': 'UNSC'
-            })
-            individual_count += 1
+        # Stream the document and drop each record once it has been read
+        for _, elem in ET.iterparse(response.raw):
+            if elem.tag == 'INDIVIDUAL':
+                primary_name, aliases = parse_record(elem, INDIVIDUAL_NAME_TAGS, 'INDIVIDUAL_ALIAS')
+                if primary_name:
+                    individual_records.append({
+                        'primary_name': primary_name,
+                        'aliases': aliases,
+                        'category': 'individual',
+                        'source': 'UNSC'
+                    })
+                elem.clear()
+            elif elem.tag == 'ENTITY':
+                primary_name, aliases = parse_record(elem, ENTITY_NAME_TAGS, 'ENTITY_ALIAS')
+                if primary_name:
+                    entity_records.append({
+                        'primary_name': primary_name,
+                        'aliases': aliases,
+                        'category': 'entity',
+                        'source': 'UNSC'
+                    })
+                elem.clear()
     
-    # Process ENTITIES
-    for entity in root.findall('.//ENTITY'):
-        primary_name = entity.find('FIRST_NAME').text if entity.find('FIRST_NAME') is not None else ''
-        
-        aliases = []
-        for alias in entity.findall('ENTITY_ALIAS'):
-            alias_name = alias.find('ALIAS_NAME').text if alias.find('ALIAS_NAME') is not None else ''
-            if alias_name:
-                aliases.append(alias_name)
-        orig_script = entity.find('NAME_ORIGINAL_SCRIPT').text if entity.find('NAME_ORIGINAL_SCRIPT') is not None else ''
-        if orig_script and orig_script not in aliases:
-            aliases.append(orig_script)
-        
-        if primary_name:
-            records.append({
-                'primary_name': primary_name,
-                'aliases': aliases,
-                'category': 'entity',
-                'source': 'UNSC'
-            })
-            entity_count += 1
+    individual_count = len(individual_records)
+    entity_count = len(entity_records)
     
     logging.info(f'Processed {individual_count} individuals and {entity_count} entities')
     
-    with open(OUTPUT_JSON, 'w', encoding='utf-8') as f:
-        json.dump(records, f, ensure_ascii=False, indent=2)
+    # Individuals first, then entities, replacing the old file only once complete
+    write_json_records(OUTPUT_JSON, chain(individual_records, entity_records))
     
     logging.info(f'Data saved to {OUTPUT_JSON}')
 
@@ -2,7 +2,7 @@
 """
 Run All Scrapers
 
-This script serves as a single entry point to run all data scrapers sequentially:
+This script serves as a single entry point to run all data scrapers concurrently:
 1. MHA Banned Organizations Scraper
 2. OFAC SDN List Scraper
 
@@ -10,30 +10,41 @@ It provides status updates for each scraper.
 """
 
 import sys
+from multiprocessing import Process
 
 from app.services.scraper_service import MHABannedOrgScraper
 from app.services.ofac_scraper_service import OFACSDNScraper
 
+# Each runs one scraper in a child process, reporting success through the exit code
+def run_mha_scraper():
+    sys.exit(0 if MHABannedOrgScraper().run() else 1)
+
+def run_ofac_scraper():
+    sys.exit(0 if OFACSDNScraper().scrape_and_save() else 1)
+
 def main():
-    """Main function to run all scrapers sequentially."""
+    """Main function to run all scrapers concurrently."""
     
-    print("--- Starting MHA Scraper ---")
-    mha_scraper = MHABannedOrgScraper()
-    mha_success = mha_scraper.scrape_and_save()
-    if mha_success:
-        print("--- MHA Scraper Finished Successfully ---")
-    else:
-        print("--- MHA Scraper Failed ---")
+    # The downloads are independent, so run each scraper in its own process.
+    # Processes rather than threads: the MHA scraper forks its own worker pool,
+    # which is only safe from a single-threaded parent.
+    scrapers = {"MHA": run_mha_scraper, "OFAC": run_ofac_scraper}
+    processes = {}
+    for name, run_scraper in scrapers.items():
+        print(f"--- Starting {name} Scraper ---")
+        processes[name] = Process(target=run_scraper)
+        processes[name].start()
     
-    print("--- Starting OFAC Scraper ---")
-    ofac_scraper = OFACSDNScraper()
-    ofac_success = ofac_scraper.scrape_and_save()
-    if ofac_success:
-        print("--- OFAC Scraper Finished Successfully ---")
-    else:
-        print("--- OFAC Scraper Failed ---")
+    results = {}
+    for name, process in processes.items():
+        process.join()
+        results[name] = process.exitcode == 0
+        if results[name]:
+            print(f"--- {name} Scraper Finished Successfully ---")
+        else:
+            print(f"--- {name} Scraper Failed ---")
     
-    if mha_success and ofac_success:
+    if all(results.values()):
         print("All scrapers completed successfully!")
         sys.exit(0)
     else:
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import sys
 import logging
+from multiprocessing import Process
 from app.services.scraper_service import MHABannedOrgScraper
 from scripts.ingest_un_data import main as un_main
 from scripts.ingest_ofac_data import main as ofac_main
@@ -8,24 +9,36 @@ from scripts.ingest_data import main as ingest_main
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+def run_mha_scraper():
+    if not MHABannedOrgScraper().run():
+        sys.exit(1)
+
 def run_pipeline():
     logging.info('Starting pipeline...')
     
-    logging.info('Running MHA scraper...')
-    mha_scraper = MHABannedOrgScraper()
-    mha_success = mha_scraper.scrape_and_save()
-    if not mha_success:
-        logging.error('MHA scraper failed')
-        sys.exit(1)
-    logging.info('MHA scraper completed')
+    # The three fetches hit independent sources, so run them side by side in
+    # separate processes; only the final ingest needs all of their output files
+    fetches = {
+        'MHA scraper': run_mha_scraper,
+        'UN data ingest': un_main,
+        'OFAC data ingest': ofac_main,
+    }
+    processes = {}
+    for name, target in fetches.items():
+        logging.info(f'Running {name}...')
+        processes[name] = Process(target=target)
+        processes[name].start()
     
-    logging.info('Running UN data ingest...')
-    un_main()
-    logging.info('UN data ingest completed')
-    
-    logging.info('Running OFAC data ingest...')
-    ofac_main()
-    logging.info('OFAC data ingest completed')
+    failed = []
+    for name, process in processes.items():
+        process.join()
+        if process.exitcode == 0:
+            logging.info(f'{name} completed')
+        else:
+            logging.error(f'{name} failed')
+            failed.append(name)
+    if failed:
+        sys.exit(1)
     
     logging.info('Running main data ingestion...')
     ingest_main()
@@ -8,15 +8,20 @@ the data by listing all entities and their counts.
 
 import os
 import sys
-from sqlalchemy import create_engine
+from collections import defaultdict
+from sqlalchemy import create_engine, distinct, event, func, select
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
 
 # Add the parent directory to the path so we can import our models
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
+from app.db.session import tune_sqlite_engine
 from app.models.entity import Base, Entity, Alias, Sanction
 
+# Number of entities held in memory at a time while listing them
+ENTITY_CHUNK_SIZE = 200
+
 class DatabaseVerifier:
     """Handles verification of database data."""
     
@@ -37,6 +42,18 @@ class DatabaseVerifier:
         try:
             print(f"Connecting to database: {self.db_url}")
             self.engine = create_engine(self.db_url)
+            tune_sqlite_engine(self.engine)
+            
+            if self.engine.dialect.name == "sqlite":
+                # pysqlite runs SELECTs outside of any transaction; emit BEGIN ourselves
+                # so all verification queries in the session read one snapshot
+                @event.listens_for(self.engine, "connect")
+                def disable_pysqlite_begin(dbapi_connection, connection_record):
+                    dbapi_connection.isolation_level = None
+                
+                @event.listens_for(self.engine, "begin")
+                def begin_read_transaction(conn):
+                    conn.exec_driver_sql("BEGIN")
             
             # Create session factory
             self.Session = sessionmaker(bind=self.engine)
@@ -61,26 +78,54 @@ class DatabaseVerifier:
             print("QUERYING ENTITIES TABLE")
             print("=" * 60)
             
-            # Query all entities from the database
-            entities = self.session.query(Entity).all()
+            entity_count = self.session.query(func.count(Entity.id)).scalar()
             
-            if not entities:
+            if not entity_count:
                 print("No entities found in the database.")
                 return 0
             
-            print(f"Found {len(entities)} entities in the database:\n")
-            
-            # Print each entity with details
-            for i, entity in enumerate(entities, 1):
-                print(f"{i:3d}. {entity.name}")
-                print(f"     Type: {entity.type}")
-                print(f"     Source: {entity.source or 'Unknown'}")
-                print(f"     Aliases: {len(entity.aliases)} alias(es)")
-                print(f"     Sanctions: {len(entity.sanctions)} sanction(s)")
-                print(f"     Date Added: {entity.date_added}")
-                print()
-            
-            return len(entities)
+            print(f"Found {entity_count} entities in the database:\n")
+            
+            # Only the number of aliases and sanctions is shown, so count them per
+            # entity in grouped subqueries instead of loading the child rows
+            alias_counts = self.session.query(
+                Alias.entity_id, func.count(Alias.id).label('n')
+            ).group_by(Alias.entity_id).subquery()
+            sanction_counts = self.session.query(
+                Sanction.entity_id, func.count(Sanction.id).label('n')
+            ).group_by(Sanction.entity_id).subquery()
+            
+            # Select only the displayed columns and stream the rows in chunks;
+            # plain rows skip ORM instrumentation and the identity map
+            stmt = select(
+                Entity.name,
+                Entity.type,
+                Entity.source,
+                Entity.date_added,
+                func.coalesce(alias_counts.c.n, 0),
+                func.coalesce(sanction_counts.c.n, 0)
+            ).outerjoin(
+                alias_counts, alias_counts.c.entity_id == Entity.id
+            ).outerjoin(
+                sanction_counts, sanction_counts.c.entity_id == Entity.id
+            ).order_by(Entity.id).execution_options(yield_per=ENTITY_CHUNK_SIZE)
+            
+            # Print each entity with details, one write per entity
+            write = sys.stdout.write
+            for i, (name, entity_type, source, date_added, alias_count, sanction_count) in enumerate(
+                self.session.execute(stmt), 1
+            ):
+                write(
+                    f"{i:3d}. {name}\n"
+                    f"     Type: {entity_type}\n"
+                    f"     Source: {source or 'Unknown'}\n"
+                    f"     Aliases: {alias_count} alias(es)\n"
+                    f"     Sanctions: {sanction_count} sanction(s)\n"
+                    f"     Date Added: {date_added}\n"
+                    "\n"
+                )
+            
+            return entity_count
             
         except SQLAlchemyError as e:
             print(f"Error querying entities: {e}")
@@ -98,29 +143,39 @@ class DatabaseVerifier:
             print("ALIASES SUMMARY")
             print("=" * 60)
             
-            # Query all aliases
-            aliases = self.session.query(Alias).all()
+            # Count aliases in the database rather than loading them
+            alias_total = self.session.query(func.count(Alias.id)).scalar()
             
-            if not aliases:
+            if not alias_total:
                 print("No aliases found in the database.")
                 return 0
             
-            print(f"Total aliases in database: {len(aliases)}")
+            print(f"Total aliases in database: {alias_total}")
             
-            # Group aliases by entity
-            entity_alias_count = {}
-            for alias in aliases:
-                entity_name = alias.entity.name
-                if entity_name not in entity_alias_count:
-                    entity_alias_count[entity_name] = []
-                entity_alias_count[entity_name].append(alias.alias_name)
+            entities_with_aliases = self.session.query(func.count(distinct(Entity.name))).join(
+                Alias, Alias.entity_id == Entity.id
+            ).scalar()
             
-            print(f"Entities with aliases: {len(entity_alias_count)}")
+            print(f"Entities with aliases: {entities_with_aliases}")
             print("\nTop 10 entities by alias count:")
             
-            # Sort by number of aliases and show top 10
-            sorted_entities = sorted(entity_alias_count.items(), key=lambda x: len(x[1]), reverse=True)
-            for i, (entity_name, aliases_list) in enumerate(sorted_entities[:10], 1):
+            # Rank entity names by alias count in the database; ties keep the
+            # order in which each name's first alias was added
+            alias_count = func.count(Alias.id)
+            top_entities = self.session.query(Entity.name, alias_count).join(
+                Alias, Alias.entity_id == Entity.id
+            ).group_by(Entity.name).order_by(alias_count.desc(), func.min(Alias.id)).limit(10).all()
+            
+            # Fetch alias names only for the top entities
+            entity_alias_names = defaultdict(list)
+            rows = self.session.query(Entity.name, Alias.alias_name).join(
+                Alias, Alias.entity_id == Entity.id
+            ).filter(Entity.name.in_([name for name, _ in top_entities])).order_by(Alias.id)
+            for entity_name, alias_name in rows:
+                entity_alias_names[entity_name].append(alias_name)
+            
+            sorted_entities = [(name, entity_alias_names[name]) for name, _ in top_entities]
+            for i, (entity_name, aliases_list) in enumerate(sorted_entities, 1):
                 print(f"{i:2d}. {entity_name}: {len(aliases_list)} aliases")
                 if len(aliases_list) <= 5:  # Show all aliases if 5 or fewer
                     for alias in aliases_list:
@@ -131,7 +186,7 @@ class DatabaseVerifier:
                     print(f"    ... and {len(aliases_list) - 3} more")
                 print()
             
-            return len(aliases)
+            return alias_total
             
         except SQLAlchemyError as e:
             print(f"Error querying aliases: {e}")
@@ -149,40 +204,34 @@ class DatabaseVerifier:
             print("SANCTIONS SUMMARY")
             print("=" * 60)
             
-            # Query all sanctions
-            sanctions = self.session.query(Sanction).all()
+            # Count and group sanctions in the database instead of loading every row
+            sanction_total = self.session.query(func.count(Sanction.id)).scalar()
             
-            if not sanctions:
+            if not sanction_total:
                 print("No sanctions found in the database.")
                 return 0
             
-            print(f"Total sanctions in database: {len(sanctions)}")
+            print(f"Total sanctions in database: {sanction_total}")
             
             # Group by sanctioning body
-            sanctioning_bodies = {}
-            for sanction in sanctions:
-                body = sanction.sanctioning_body
-                if body not in sanctioning_bodies:
-                    sanctioning_bodies[body] = 0
-                sanctioning_bodies[body] += 1
+            sanctioning_bodies = self.session.query(
+                Sanction.sanctioning_body, func.count(Sanction.id)
+            ).group_by(Sanction.sanctioning_body).order_by(Sanction.sanctioning_body).all()
             
             print("\nSanctions by sanctioning body:")
-            for body, count in sorted(sanctioning_bodies.items()):
+            for body, count in sanctioning_bodies:
                 print(f"  {body}: {count} sanctions")
             
             # Group by program
-            programs = {}
-            for sanction in sanctions:
-                program = sanction.program
-                if program not in programs:
-                    programs[program] = 0
-                programs[program] += 1
+            programs = self.session.query(
+                Sanction.program, func.count(Sanction.id)
+            ).group_by(Sanction.program).order_by(Sanction.program).all()
             
             print("\nSanctions by program:")
-            for program, count in sorted(programs.items()):
+            for program, count in programs:
                 print(f"  {program}: {count} sanctions")
             
-            return len(sanctions)
+            return sanction_total
             
         except SQLAlchemyError as e:
             print(f"Error querying sanctions: {e}")
@@ -198,23 +247,23 @@ class DatabaseVerifier:
             print("=" * 60)
             
             # Check for entities without sanctions
-            entities_without_sanctions = self.session.query(Entity).filter(
-                ~Entity.sanctions.any()
-            ).all()
+            entities_without_sanctions = self.session.query(Entity.name).outerjoin(
+                Sanction, Sanction.entity_id == Entity.id
+            ).filter(Sanction.id.is_(None)).order_by(Entity.id).all()
             
             if entities_without_sanctions:
                 print(f"Warning: {len(entities_without_sanctions)} entities have no sanctions:")
-                for entity in entities_without_sanctions[:5]:  # Show first 5
-                    print(f"  - {entity.name}")
+                for (entity_name,) in entities_without_sanctions[:5]:  # Show first 5
+                    print(f"  - {entity_name}")
                 if len(entities_without_sanctions) > 5:
                     print(f"  ... and {len(entities_without_sanctions) - 5} more")
             else:
                 print("✓ All entities have at least one sanction")
             
             # Check for aliases without entities (should not happen due to foreign keys)
-            orphaned_aliases = self.session.query(Alias).filter(
-                Alias.entity_id.notin_(self.session.query(Entity.id))
-            ).count()
+            orphaned_aliases = self.session.query(func.count(Alias.id)).outerjoin(
+                Entity, Alias.entity_id == Entity.id
+            ).filter(Entity.id.is_(None)).scalar()
             
             if orphaned_aliases > 0:
                 print(f"Warning: {orphaned_aliases} aliases have no associated entity")
@@ -222,9 +271,9 @@ class DatabaseVerifier:
                 print("✓ All aliases are properly linked to entities")
             
             # Check for sanctions without entities (should not happen due to foreign keys)
-            orphaned_sanctions = self.session.query(Sanction).filter(
-                Sanction.entity_id.notin_(self.session.query(Entity.id))
-            ).count()
+            orphaned_sanctions = self.session.query(func.count(Sanction.id)).outerjoin(
+                Entity, Sanction.entity_id == Entity.id
+            ).filter(Entity.id.is_(None)).scalar()
             
             if orphaned_sanctions > 0:
                 print(f"Warning: {orphaned_sanctions} sanctions have no associated entity")
@@ -0,0 +1,126 @@
+import json
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api import endpoints
+from app.api.endpoints import ScreenRequest, get_entity, screen_entity
+from app.db.session import Base
+from app.models.entity import Alias, Entity, create_entity_with_aliases
+
+@pytest.fixture
+def db():
+    """An in-memory database seeded with a few sanctioned entities."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        create_entity_with_aliases("Lashkar-E-Taiba", "terrorist", ["LeT"], source="MHA India"),
+        create_entity_with_aliases("Al-Qaeda", "terrorist", ["AQ", "The Base"], source="UNSC"),
+        create_entity_with_aliases("Babbar Khalsa International", "terrorist", [], source="MHA India"),
+    ])
+    session.commit()
+    endpoints._ENTITY_CACHE["data"] = endpoints.build_screening_arrays([])
+    endpoints._ENTITY_CACHE["expires"] = 0.0
+    yield session
+    session.close()
+    engine.dispose()
+
+@pytest.fixture
+def statements(db):
+    """Records every SQL statement emitted on the test engine."""
+    executed = []
+    engine = db.get_bind()
+    listener = lambda conn, cursor, statement, *args: executed.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    yield executed
+    event.remove(engine, "before_cursor_execute", listener)
+
+def screen(db, entity_name):
+    """Runs a screen request and returns the decoded list of matches."""
+    response = screen_entity(ScreenRequest(entity_name=entity_name), db=db)
+    return json.loads(response.body)["matches"]
+
+def test_screen_returns_fuzzy_matches(db):
+    """Tests that a close spelling is matched and the aliases are returned."""
+    matches = screen(db, "lashkar e taiba")
+    assert [m["name"] for m in matches] == ["Lashkar-E-Taiba"]
+    assert matches[0]["aliases"] == ["LeT"]
+
+def test_screen_ignores_accents_and_spacing(db):
+    """Tests that names are compared in their normalized form."""
+    assert [m["name"] for m in screen(db, "Al-Qaéda  ")] == ["Al-Qaeda"]
+
+def test_screen_orders_matches_by_score(db):
+    """Tests that hydrated matches keep the fuzzy ranking, best first."""
+    db.add(create_entity_with_aliases("Lashkar-E-Taiba Front", "terrorist", []))
+    db.commit()
+    endpoints.refresh_entity_cache(db)
+    matches = screen(db, "Lashkar-E-Taiba Front")
+    assert [m["name"] for m in matches] == ["Lashkar-E-Taiba Front", "Lashkar-E-Taiba"]
+
+def test_screen_uses_cached_names(db):
+    """Tests that entities added after the cache is built are not scanned until a refresh."""
+    screen(db, "Al-Qaeda")
+    db.add(create_entity_with_aliases("Indian Mujahideen", "terrorist", []))
+    db.commit()
+    assert not screen(db, "Indian Mujahideen")
+
+    endpoints.refresh_entity_cache(db)
+    assert screen(db, "Indian Mujahideen")
+
+def test_screen_survives_reingest_without_refresh(db):
+    """Tests that ids reused by a re-ingest are never reported under the wrong name."""
+    assert [m["name"] for m in screen(db, "Al-Qaeda")] == ["Al-Qaeda"]
+    # Re-ingest the way scripts/ingest_data.py does: delete everything and
+    # insert again, so SQLite hands out rowids from 1 and shifts every entity
+    db.query(Alias).delete()
+    db.query(Entity).delete()
+    db.commit()
+    db.add_all([
+        create_entity_with_aliases("Acme Trading", "organization", []),
+        create_entity_with_aliases("Lashkar-E-Taiba", "terrorist", ["LeT"]),
+        create_entity_with_aliases("Al-Qaeda", "terrorist", ["AQ"]),
+    ])
+    db.commit()
+    al_qaeda_id = db.query(Entity.id).filter(Entity.name == "Al-Qaeda").scalar()
+
+    matches = screen(db, "Al-Qaeda")
+    assert [(m["entity_id"], m["name"]) for m in matches] == [(al_qaeda_id, "Al-Qaeda")]
+
+def test_trigram_path_leaves_cache_empty(db, monkeypatch):
+    """Tests that Postgres deployments never load or refresh the in-memory cache."""
+    monkeypatch.setattr(db.get_bind().dialect, "name", "postgresql")
+    # Stand-in for the pg_trgm shortlist, which needs a real Postgres server
+    monkeypatch.setattr(endpoints, "get_trigram_candidates", lambda db, query: endpoints.build_screening_arrays(
+        db.query(Entity.id, Entity.name_norm).all()
+    ))
+    endpoints.refresh_entity_cache(db)
+    assert [m["name"] for m in screen(db, "Al-Qaeda")] == ["Al-Qaeda"]
+    ids, names, lengths = endpoints._ENTITY_CACHE["data"]
+    assert len(ids) == len(names) == len(lengths) == 0
+
+def test_screen_loads_aliases_without_n_plus_one(db, statements):
+    """Tests that hydrating several matches costs a fixed number of queries."""
+    db.add_all([
+        create_entity_with_aliases("Lashkar-E-Jhangvi", "terrorist", ["LeJ"]),
+        create_entity_with_aliases("Lashkar-E-Omar", "terrorist", ["Al-Qanoon"]),
+    ])
+    db.commit()
+    endpoints.refresh_entity_cache(db)
+    db.expire_all()
+    statements.clear()
+    assert len(screen(db, "Lashkar")) == 3
+    # one query for the entities, one batched query for all of their aliases
+    assert len(statements) == 2
+
+def test_get_entity_eager_loads_aliases(db, statements):
+    """Tests that the entity profile fetches its aliases in one batched query."""
+    entity_id = screen(db, "Al-Qaeda")[0]["entity_id"]
+    db.expire_all()
+    statements.clear()
+    result = json.loads(get_entity(entity_id, db=db).body)
+    assert sorted(result["aliases"]) == ["AQ", "The Base"]
+    assert len(statements) == 2
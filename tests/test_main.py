@@ -0,0 +1,25 @@
+from starlette.routing import Match
+
+from app.api.endpoints import get_entity, screen_entity
+from app.main import app
+
+def resolve(path, method):
+    """Returns the first route that fully matches, as Starlette would dispatch."""
+    scope = {"type": "http", "path": path, "method": method}
+    for route in app.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route
+    return None
+
+def test_screen_resolves_to_api_router():
+    """Tests that the React catch-all and static mount do not shadow the API."""
+    assert resolve("/v1/screen", "POST").endpoint is screen_entity
+
+def test_entity_resolves_to_api_router():
+    """Tests that entity lookups reach the API rather than index.html."""
+    assert resolve("/v1/entity/1", "GET").endpoint is get_entity
+
+def test_unknown_paths_fall_through_to_frontend():
+    """Tests that client-side routes are still served the React app."""
+    assert resolve("/entity/1", "GET").name == "serve_react_app"
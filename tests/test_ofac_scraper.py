@@ -0,0 +1,27 @@
+import pytest
+from app.services.ofac_scraper_service import OFACSDNScraper
+
+@pytest.mark.parametrize("remarks, expected_aliases", [
+    # Quoted and bare aliases after each a.k.a./f.k.a./n.k.a. marker, in order
+    pytest.param("a.k.a. 'ALPHA'; f.k.a. 'BETA'; n.k.a. 'GAMMA'",
+                 ["ALPHA", "BETA", "GAMMA"], id="markers"),
+    pytest.param('a.k.a. BNC; n.k.a. "NEW NAME"',
+                 ["BNC", "NEW NAME"], id="bare-and-double-quoted"),
+    # Commas inside a quoted alias are part of the alias
+    pytest.param("a.k.a. 'BANCO NACIONAL, S.A.'; f.k.a. 'OLD NAME'",
+                 ["BANCO NACIONAL, S.A", "OLD NAME"], id="comma-inside-quotes"),
+    # Dotted names are kept whole, without a fragment cut at the first dot
+    pytest.param("a.k.a. 'A.B. CORP'",
+                 ["A.B. CORP"], id="no-dot-fragments"),
+    # An unclosed quote does not swallow the following aliases
+    pytest.param("a.k.a. 'ABC; a.k.a. 'DEF'",
+                 ["ABC", "DEF"], id="unclosed-quote"),
+    pytest.param("a.k.a. 'SAME'; a.k.a. 'SAME'",
+                 ["SAME"], id="duplicates"),
+    pytest.param("-0-", [], id="empty-marker"),
+])
+def test_parse_name_and_aliases(remarks, expected_aliases):
+    """Tests alias extraction from the SDN remarks field."""
+    name, aliases = OFACSDNScraper().parse_name_and_aliases(remarks)
+    assert name == ""
+    assert aliases == expected_aliases
@@ -0,0 +1,13 @@
+from sqlalchemy import create_engine
+
+from app.db.session import pool_options
+
+def test_in_memory_sqlite_gets_no_pool_sizing():
+    """Tests that in-memory SQLite URLs can be used as DATABASE_URL."""
+    assert pool_options("sqlite://") == {}
+    create_engine("sqlite://", pool_pre_ping=True, **pool_options("sqlite://")).dispose()
+
+def test_queue_pool_urls_are_sized_for_the_threadpool():
+    """Tests that file SQLite and Postgres URLs keep the threadpool-sized pool."""
+    assert pool_options("sqlite:///./project_sentinel.db") == {"pool_size": 20, "max_overflow": 10}
+    assert pool_options("postgresql://user@localhost/sentinel") == {"pool_size": 20, "max_overflow": 10}